@@ -0,0 +1,6 @@
+# Per-retailer request limits: at most `max_workers` pages are fetched at once,
+# and request starts are spaced at least `min_interval` seconds apart.
+RATE_LIMITS = {
+    "asos": {"max_workers": 4, "min_interval": 1.0},
+    "hnm": {"max_workers": 4, "min_interval": 0.0},
+}
@@ -1,4 +1,13 @@
 import sqlite3
+from datetime import datetime, timezone
+
+# Columns added after the original schema; existing databases are migrated on setup.
+ADDED_COLUMNS = {
+    "retailer": "TEXT",
+    "updated_at": "TEXT",
+    "change_seq": "INTEGER",
+}
+
 
 def setup_database(test_mode=False):
     """
@@ -8,6 +17,9 @@ def setup_database(test_mode=False):
     db_name = ":memory:" if test_mode else "clothing.db"
     connection = sqlite3.connect(db_name)
     cursor = connection.cursor()
+    if not test_mode:
+        # WAL lets exports and analysts read while a crawl is writing.
+        cursor.execute("PRAGMA journal_mode=WAL")
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS items (
             unique_id TEXT PRIMARY KEY,
@@ -18,21 +30,65 @@ def setup_database(test_mode=False):
             category TEXT,
             url TEXT,
             image_url TEXT,
-            availability TEXT
+            availability TEXT,
+            retailer TEXT,
+            updated_at TEXT,
+            change_seq INTEGER
         )
     """)
+
+    existing_columns = {row[1] for row in cursor.execute("PRAGMA table_info(items)")}
+    for column, column_type in ADDED_COLUMNS.items():
+        if column not in existing_columns:
+            cursor.execute(f"ALTER TABLE items ADD COLUMN {column} {column_type}")
+
+    # Tombstones for items removed as stale, so incremental exports can see deletions.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS deleted_items (
+            unique_id TEXT PRIMARY KEY,
+            retailer TEXT,
+            updated_at TEXT,            -- When the item was deleted
+            change_seq INTEGER
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS change_counter (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            change_seq INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO change_counter (id, change_seq) VALUES (1, 0)")
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_items_change_seq ON items (change_seq)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_deleted_items_change_seq ON deleted_items (change_seq)")
     connection.commit()
     return connection
 
 
+def next_change_seq(cursor):
+    """
+    Claims the next change sequence number inside the caller's write transaction.
+    The UPDATE takes SQLite's write lock, so numbers are handed out in commit order.
+    """
+    cursor.execute("UPDATE change_counter SET change_seq = change_seq + 1 WHERE id = 1")
+    return cursor.execute("SELECT change_seq FROM change_counter WHERE id = 1").fetchone()[0]
+
+
 def store_in_db(items, connection):
     """
     Stores or updates product data in the SQLite database.
+    `updated_at` and `change_seq` are only bumped when a row is new or one of its values has changed.
     """
     cursor = connection.cursor()
+    change_seq = next_change_seq(cursor)
+    updated_at = datetime.now(timezone.utc).isoformat(timespec="microseconds")
+    rows = [{"retailer": None, **item, "updated_at": updated_at, "change_seq": change_seq} for item in items]
+
     cursor.executemany("""
-        INSERT INTO items (unique_id, id, name, price, size, category, url, image_url, availability)
-        VALUES (:unique_id, :id, :name, :price, :size, :category, :url, :image_url, :availability)
+        INSERT INTO items (unique_id, id, name, price, size, category, url, image_url, availability, retailer,
+                           updated_at, change_seq)
+        VALUES (:unique_id, :id, :name, :price, :size, :category, :url, :image_url, :availability, :retailer,
+                :updated_at, :change_seq)
         ON CONFLICT(unique_id) DO UPDATE SET
             name=excluded.name,
             price=excluded.price,
@@ -40,6 +96,38 @@ def store_in_db(items, connection):
             category=excluded.category,
             url=excluded.url,
             image_url=excluded.image_url,
-            availability=excluded.availability
-    """, items)
+            availability=excluded.availability,
+            retailer=excluded.retailer,
+            updated_at=excluded.updated_at,
+            change_seq=excluded.change_seq
+        WHERE name IS NOT excluded.name
+            OR price IS NOT excluded.price
+            OR size IS NOT excluded.size
+            OR category IS NOT excluded.category
+            OR url IS NOT excluded.url
+            OR image_url IS NOT excluded.image_url
+            OR availability IS NOT excluded.availability
+            OR retailer IS NOT excluded.retailer
+    """, rows)
+    connection.commit()
+
+
+def delete_items(unique_ids, connection):
+    """
+    Deletes items from the database, recording a tombstone for each in `deleted_items`.
+    """
+    cursor = connection.cursor()
+    change_seq = next_change_seq(cursor)
+    deleted_at = datetime.now(timezone.utc).isoformat(timespec="microseconds")
+    params = [(deleted_at, change_seq, unique_id) for unique_id in unique_ids]
+
+    cursor.executemany("""
+        INSERT INTO deleted_items (unique_id, retailer, updated_at, change_seq)
+        SELECT unique_id, retailer, ?, ? FROM items WHERE unique_id = ?
+        ON CONFLICT(unique_id) DO UPDATE SET
+            retailer=excluded.retailer,
+            updated_at=excluded.updated_at,
+            change_seq=excluded.change_seq
+    """, params)
+    cursor.executemany("DELETE FROM items WHERE unique_id = ?", [(unique_id,) for unique_id in unique_ids])
     connection.commit()
@@ -0,0 +1,223 @@
+import csv
+import gzip
+import os
+from datetime import datetime, timezone
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Tables exported when present. Each must have `retailer`, `updated_at` and `change_seq` columns.
+# `deleted_items` holds tombstones for rows removed as stale.
+EXPORT_TABLES = ("items", "price_history", "deleted_items")
+REQUIRED_COLUMNS = ("retailer", "updated_at", "change_seq")
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def setup_watermarks(connection):
+    """
+    Creates the table holding the last exported `change_seq` per table.
+    """
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS export_watermarks (
+            table_name TEXT PRIMARY KEY,
+            change_seq INTEGER
+        )
+    """)
+    connection.commit()
+
+
+def get_watermark(connection, table_name):
+    row = connection.execute(
+        "SELECT change_seq FROM export_watermarks WHERE table_name = ?", (table_name,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def set_watermark(connection, table_name, change_seq):
+    connection.execute("""
+        INSERT INTO export_watermarks (table_name, change_seq) VALUES (?, ?)
+        ON CONFLICT(table_name) DO UPDATE SET change_seq=excluded.change_seq
+    """, (table_name, change_seq))
+    connection.commit()
+
+
+def get_exportable_columns(connection, table_name):
+    """
+    Returns the (name, declared type) pairs for a table, or None if the table
+    is missing or lacks the partition and change tracking columns.
+    """
+    columns = [(row[1], row[2]) for row in connection.execute(f"PRAGMA table_info({table_name})")]
+    names = {name for name, _ in columns}
+    if not columns or not all(column in names for column in REQUIRED_COLUMNS):
+        return None
+    return columns
+
+
+def partition_dir(output_dir, table_name, retailer, updated_at):
+    crawl_date = updated_at[:10] if updated_at else "unknown"
+    return os.path.join(output_dir, table_name, f"retailer={retailer or 'unknown'}", f"crawl_date={crawl_date}")
+
+
+class ParquetPartitionWriter:
+    """
+    Appends row chunks to a single Parquet file. INTEGER columns are stored as
+    int64, REAL columns as float64 and everything else as strings.
+    """
+    extension = "parquet"
+    column_types = {"INTEGER": pa.int64(), "REAL": pa.float64()} if pa else {}
+
+    def __init__(self, path, columns):
+        self.schema = pa.schema([
+            (name, self.column_types.get(column_type.upper(), pa.string()))
+            for name, column_type in columns
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema, compression="snappy")
+
+    def write(self, rows):
+        arrays = []
+        for index, field in enumerate(self.schema):
+            values = [row[index] for row in rows]
+            if field.type == pa.string():
+                values = [None if value is None else str(value) for value in values]
+            elif field.type == pa.int64():
+                values = [None if value is None else int(value) for value in values]
+            arrays.append(pa.array(values, type=field.type))
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+class CsvPartitionWriter:
+    """
+    Appends row chunks to a single gzip-compressed CSV file with a header row.
+    """
+    extension = "csv.gz"
+
+    def __init__(self, path, columns):
+        self.file = gzip.open(path, "wt", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([name for name, _ in columns])
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+def export_table(connection, table_name, columns, output_dir, snapshot_id, since=None,
+                 chunk_size=DEFAULT_CHUNK_SIZE, writer_class=None):
+    """
+    Streams rows with a `change_seq` after `since` out of a table in chunks, writing
+    one file per retailer/crawl date partition. Files are written under temporary
+    names; returns the row count, highest `change_seq` seen and (temp, final) paths.
+    """
+    writer_class = writer_class or (ParquetPartitionWriter if pq else CsvPartitionWriter)
+    names = [name for name, _ in columns]
+    retailer_index = names.index("retailer")
+    updated_at_index = names.index("updated_at")
+    change_seq_index = names.index("change_seq")
+
+    query = f"SELECT {', '.join(names)} FROM {table_name}"
+    params = ()
+    if since is not None:
+        query += " WHERE change_seq > ?"
+        params = (since,)
+    cursor = connection.cursor()
+    cursor.execute(query + " ORDER BY change_seq", params)
+
+    writers = {}
+    files = []
+    row_count = 0
+    max_change_seq = since
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+
+            partitions = {}
+            for row in rows:
+                directory = partition_dir(output_dir, table_name, row[retailer_index], row[updated_at_index])
+                partitions.setdefault(directory, []).append(row)
+                if row[change_seq_index] is not None:
+                    max_change_seq = max(max_change_seq or 0, row[change_seq_index])
+
+            for directory, partition_rows in partitions.items():
+                if directory not in writers:
+                    os.makedirs(directory, exist_ok=True)
+                    file_name = f"part-{snapshot_id}.{writer_class.extension}"
+                    temp_path = os.path.join(directory, f".{file_name}.tmp")
+                    files.append((temp_path, os.path.join(directory, file_name)))
+                    writers[directory] = writer_class(temp_path, columns)
+                writers[directory].write(partition_rows)
+
+            row_count += len(rows)
+    except BaseException:
+        close_writers(writers)
+        discard_files(files)
+        raise
+
+    close_writers(writers)
+    return row_count, max_change_seq, files
+
+
+def close_writers(writers):
+    for writer in writers.values():
+        writer.close()
+
+
+def discard_files(files):
+    for temp_path, _ in files:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def export_snapshot(connection, output_dir, incremental=True, chunk_size=DEFAULT_CHUNK_SIZE, writer_class=None):
+    """
+    Exports `items` (and `price_history`, if present) plus `deleted_items` tombstones
+    to partitioned columnar files. Parquet is used when pyarrow is installed, otherwise
+    gzip-compressed CSV. In incremental mode only rows whose `change_seq` is above the
+    stored watermark are exported. Parts are written under temporary names and renamed
+    before the watermark is committed, so a failed export leaves no partial parts behind
+    and never advances the watermark past rows that were not written out.
+    """
+    setup_watermarks(connection)
+    snapshot_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    summary = {}
+
+    for table_name in EXPORT_TABLES:
+        columns = get_exportable_columns(connection, table_name)
+        if not columns:
+            print(f"Skipping '{table_name}': table not found or missing change tracking columns.")
+            continue
+
+        since = get_watermark(connection, table_name) if incremental else None
+        since_text = f"change {since}" if since is not None else "the beginning"
+        print(f"Exporting '{table_name}' changed since {since_text}...")
+        row_count, max_change_seq, files = export_table(
+            connection, table_name, columns, output_dir, snapshot_id,
+            since=since, chunk_size=chunk_size, writer_class=writer_class,
+        )
+
+        try:
+            for temp_path, final_path in files:
+                os.replace(temp_path, final_path)
+        except BaseException:
+            discard_files(files)
+            raise
+
+        # The parts are in place before the watermark moves, so a failure from here on
+        # re-exports rows (deduplicated by change_seq) rather than losing them.
+        if max_change_seq is not None and max_change_seq != since:
+            set_watermark(connection, table_name, max_change_seq)
+
+        print(f"Exported {row_count} rows from '{table_name}'.")
+        summary[table_name] = row_count
+
+    return summary
@@ -1,6 +1,9 @@
 import argparse
+from contextlib import nullcontext
 from scheduler import schedule_updates, manual_update
 from db.database import setup_database
+from db.export import export_snapshot
+from utils.profiling import profile_run
 
 def main():
     # Assign categories and sizes
@@ -23,6 +26,21 @@ def main():
     parser.add_argument(
         "--test_mode", action="store_true", help="Use test mode (in-memory database)."
     )
+    parser.add_argument(
+        "--export", action="store_true", help="Export a snapshot of changed rows for analytics."
+    )
+    parser.add_argument(
+        "--export_dir", default="exports", help="Directory to write exported snapshots to."
+    )
+    parser.add_argument(
+        "--full_export", action="store_true", help="Export all rows, ignoring the stored watermark."
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="Profile the run (cProfile, tracemalloc and per-page timings)."
+    )
+    parser.add_argument(
+        "--profile_dir", default="profiles", help="Directory to write profile reports to."
+    )
     args = parser.parse_args()
 
     # Determine if test_mode is enabled
@@ -32,15 +50,22 @@ def main():
     print("Setting up database...")
     connection = setup_database(test_mode)
 
+    # Profile the run if requested; reports are written when the block exits
+    profiler = profile_run(args.profile_dir) if args.profile else nullcontext()
+
     try:
-        if args.schedule:
-            print("Running scheduler for automatic updates...")
-            schedule_updates(asos_categories_and_sizes, hnm_categories_and_sizes, connection, test_mode=test_mode)
-        elif args.manual:
-            print("Running manual update...")
-            manual_update(asos_categories_and_sizes, hnm_categories_and_sizes, connection, test_mode=test_mode)
-        else:
-            print("Please specify --schedule or --manual. Use -h for help.")
+        with profiler:
+            if args.schedule:
+                print("Running scheduler for automatic updates...")
+                schedule_updates(asos_categories_and_sizes, hnm_categories_and_sizes, connection, test_mode=test_mode)
+            elif args.manual:
+                print("Running manual update...")
+                manual_update(asos_categories_and_sizes, hnm_categories_and_sizes, connection, test_mode=test_mode)
+            elif args.export:
+                print(f"Exporting snapshot to '{args.export_dir}'...")
+                export_snapshot(connection, args.export_dir, incremental=not args.full_export)
+            else:
+                print("Please specify --schedule, --manual or --export. Use -h for help.")
     finally:
         # Close the connection when done
         connection.close()
@@ -3,7 +3,8 @@ import time
 from datetime import datetime
 from scrapers.asos_scraper import fetch_all_pages_with_size as fetch_asos
 from scrapers.hnm_scraper import fetch_all_pages_with_size as fetch_hnm
-from db.database import setup_database
+from db.database import setup_database, delete_items
+from utils.profiling import phase
 
 
 def fetch_data(connection, asos_categories_and_sizes, hnm_categories_and_sizes, test_mode=False):
@@ -16,35 +17,38 @@ def fetch_data(connection, asos_categories_and_sizes, hnm_categories_and_sizes,
     active_items = set()
 
     # ASOS
-    for entry in asos_categories_and_sizes:
-        category_name = entry["category_name"]
-        sizes = entry["sizes"]
-        fetched_items = fetch_asos(category_name, sizes=sizes, connection=connection)
+    with phase("asos"):
+        for entry in asos_categories_and_sizes:
+            category_name = entry["category_name"]
+            sizes = entry["sizes"]
+            fetched_items = fetch_asos(category_name, sizes=sizes, connection=connection)
 
-        if test_mode:
-            print(f"Fetched {len(fetched_items)} items from ASOS for {category_name} with sizes {sizes}:")
-            # Print only the first 3 items
-            for i, item in enumerate(fetched_items[:3]):
-                print(f"Item {i+1}: {item}")
+            if test_mode:
+                print(f"Fetched {len(fetched_items)} items from ASOS for {category_name} with sizes {sizes}:")
+                # Print only the first 3 items
+                for i, item in enumerate(fetched_items[:3]):
+                    print(f"Item {i+1}: {item}")
 
-        active_items.update(item["unique_id"] for item in fetched_items)
+            active_items.update(item["unique_id"] for item in fetched_items)
 
     # H&M
-    for entry in hnm_categories_and_sizes:
-        category_name = entry["category_name"]
-        sizes = entry["sizes"]
-        fetched_items = fetch_hnm(category_name, sizes=sizes, connection=connection)
+    with phase("hnm"):
+        for entry in hnm_categories_and_sizes:
+            category_name = entry["category_name"]
+            sizes = entry["sizes"]
+            fetched_items = fetch_hnm(category_name, sizes=sizes, connection=connection)
 
-        if test_mode:
-            print(f"Fetched {len(fetched_items)} items from H&M for {category_name} with sizes {sizes}:")
-            # Print only the first 3 items
-            for i, item in enumerate(fetched_items[:3]):
-                print(f"Item {i+1}: {item}")
+            if test_mode:
+                print(f"Fetched {len(fetched_items)} items from H&M for {category_name} with sizes {sizes}:")
+                # Print only the first 3 items
+                for i, item in enumerate(fetched_items[:3]):
+                    print(f"Item {i+1}: {item}")
 
-        active_items.update(item["unique_id"] for item in fetched_items)
+            active_items.update(item["unique_id"] for item in fetched_items)
 
     # Remove stale items from the database
-    remove_stale_items(connection, active_items)
+    with phase("remove_stale"):
+        remove_stale_items(connection, active_items)
 
     print(f"[{datetime.now()}] Data fetch completed.")
 
@@ -62,8 +66,7 @@ def remove_stale_items(connection, active_items):
     stale_items = stored_items - active_items
     if stale_items:
         print(f"Removing {len(stale_items)} stale items from the database...")
-        cursor.executemany("DELETE FROM items WHERE unique_id = ?", [(item,) for item in stale_items])
-        connection.commit()
+        delete_items(stale_items, connection)
         print(f"Removed {len(stale_items)} stale items.")
     else:
         print("No stale items found to remove.")
@@ -85,30 +88,32 @@ def manual_update(asos_categories_and_sizes, hnm_categories_and_sizes, connectio
     print("Performing manual update...")
 
     # Perform the same update process for ASOS
-    for category_and_size in asos_categories_and_sizes:
-        category_name = category_and_size["category_name"]
-        sizes = category_and_size["sizes"]
-        print(f"Fetching data for {category_name} with sizes {sizes}...")
-        fetched_items = fetch_asos(category_name, sizes=sizes, connection=connection)
-
-        if test_mode:
-            print(f"Fetched {len(fetched_items)} items from ASOS for {category_name} with sizes {sizes}:")
-            # Print only the first 3 items
-            for i, item in enumerate(fetched_items[:3]):
-                print(f"Item {i+1}: {item}")
+    with phase("asos"):
+        for category_and_size in asos_categories_and_sizes:
+            category_name = category_and_size["category_name"]
+            sizes = category_and_size["sizes"]
+            print(f"Fetching data for {category_name} with sizes {sizes}...")
+            fetched_items = fetch_asos(category_name, sizes=sizes, connection=connection)
+
+            if test_mode:
+                print(f"Fetched {len(fetched_items)} items from ASOS for {category_name} with sizes {sizes}:")
+                # Print only the first 3 items
+                for i, item in enumerate(fetched_items[:3]):
+                    print(f"Item {i+1}: {item}")
 
     # Perform the same update process for H&M
-    for category_and_size in hnm_categories_and_sizes:
-        category_name = category_and_size["category_name"]
-        sizes = category_and_size["sizes"]
-        print(f"Fetching data for {category_name} with sizes {sizes}...")
-        fetched_items = fetch_hnm(category_name, sizes=sizes, connection=connection)
-
-        if test_mode:
-            print(f"Fetched {len(fetched_items)} items from H&M for {category_name} with sizes {sizes}:")
-            # Print only the first 3 items
-            for i, item in enumerate(fetched_items[:3]):
-                print(f"Item {i+1}: {item}")
+    with phase("hnm"):
+        for category_and_size in hnm_categories_and_sizes:
+            category_name = category_and_size["category_name"]
+            sizes = category_and_size["sizes"]
+            print(f"Fetching data for {category_name} with sizes {sizes}...")
+            fetched_items = fetch_hnm(category_name, sizes=sizes, connection=connection)
+
+            if test_mode:
+                print(f"Fetched {len(fetched_items)} items from H&M for {category_name} with sizes {sizes}:")
+                # Print only the first 3 items
+                for i, item in enumerate(fetched_items[:3]):
+                    print(f"Item {i+1}: {item}")
 
     print("Manual update completed.")
 
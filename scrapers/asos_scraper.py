@@ -1,6 +1,11 @@
 import requests
-from time import sleep
 from db.database import store_in_db
+from config.settings import RATE_LIMITS
+from utils.pagingation import RateLimiter, fetch_pages_concurrently
+from utils.profiling import span
+
+# Shared by every request to ASOS so the limit holds across sizes, categories and threads.
+rate_limiter = RateLimiter(RATE_LIMITS["asos"]["min_interval"])
 
 # ASOS-specific mappings
 SIZE_CODE_MAP = {
@@ -43,6 +48,7 @@ def fetch_asos_data(category_id, size_code, offset=0, limit=72):
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
     }
     try:
+        rate_limiter.wait()
         response = requests.get(url, params=params, headers=headers)
         response.raise_for_status()
         return response.json()
@@ -67,15 +73,20 @@ def parse_asos_data(json_data, size, category_name):
             "url": f"https://www.asos.com/{product.get('url')}",
             "image_url": product.get("imageUrl"),
             "availability": "In Stock",
+            "retailer": "asos",
         }
         items.append(item)
     return items
 
 
-def fetch_all_pages_with_size(category_name, sizes=None, limit=72, connection=None):
+def fetch_all_pages_with_size(category_name, sizes=None, limit=72, connection=None, max_workers=None):
     """
     Fetches all products for a given category and size filters, handling pagination.
+    The first response's `itemCount` is used to work out every remaining offset,
+    which are then fetched concurrently within the rate limit. Falls back to
+    stepping through offsets until an empty page when `itemCount` is missing.
     """
+    max_workers = max_workers or RATE_LIMITS["asos"]["max_workers"]
     category_id = CATEGORY_ID_MAP.get(category_name)
     if not category_id:
         print(f"Category '{category_name}' not found in ASOS category map.")
@@ -88,21 +99,44 @@ def fetch_all_pages_with_size(category_name, sizes=None, limit=72, connection=No
 
     all_items = []
     for size, size_code in zip(sizes, size_codes):
-        offset = 0
-        while True:
-            print(f"Fetching data for category '{category_name}', size '{size}', offset {offset}...")
-            data = fetch_asos_data(category_id, size_code=size_code, offset=offset, limit=limit)
+        def fetch_offset(offset):
+            with span("asos.fetch", category=category_name, size=size, offset=offset):
+                return fetch_asos_data(category_id, size_code=size_code, offset=offset, limit=limit)
+
+        print(f"Fetching data for category '{category_name}', size '{size}', offset 0...")
+        first_page = fetch_offset(0)
+        if not first_page or not first_page.get("products"):
+            print(f"No more products found for size '{size}'. Stopping pagination.")
+            continue
+
+        pages = [(0, first_page)]
+        item_count = first_page.get("itemCount")
+
+        if item_count:
+            offsets = list(range(limit, item_count, limit))
+            print(f"Found {item_count} products for size '{size}', fetching {len(offsets)} more pages...")
+            pages.extend(zip(offsets, fetch_pages_concurrently(fetch_offset, offsets, max_workers=max_workers)))
+        else:
+            offset = limit
+            while True:
+                print(f"Fetching data for category '{category_name}', size '{size}', offset {offset}...")
+                data = fetch_offset(offset)
+                if not data or not data.get("products"):
+                    break
+                pages.append((offset, data))
+                offset += limit
+
+        for offset, data in pages:
             if not data or not data.get("products"):
-                print(f"No more products found for size '{size}'. Stopping pagination.")
-                break
+                print(f"No products returned for size '{size}' at offset {offset}.")
+                continue
 
-            items = parse_asos_data(data, size, category_name)
+            with span("asos.parse", category=category_name, size=size, offset=offset):
+                items = parse_asos_data(data, size, category_name)
             all_items.extend(items)
 
+            # Store on the calling thread; the SQLite connection is not shared with the workers.
             if connection:
-                store_in_db(items, connection)
-
-            offset += limit
-            sleep(1)
+                with span("asos.store", category=category_name, size=size, offset=offset):
+                    store_in_db(items, connection)
     return all_items
-
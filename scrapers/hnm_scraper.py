@@ -1,5 +1,11 @@
 import requests
 from db.database import store_in_db
+from config.settings import RATE_LIMITS
+from utils.pagingation import RateLimiter, fetch_pages_concurrently
+from utils.profiling import span
+
+# Shared by every request to H&M so the limit holds across sizes, categories and threads.
+rate_limiter = RateLimiter(RATE_LIMITS["hnm"]["min_interval"])
 
 def fetch_hnm_data(category_id, size_filter=None, page=1, page_size=36):
     """
@@ -27,6 +33,7 @@ def fetch_hnm_data(category_id, size_filter=None, page=1, page_size=36):
     }
 
     try:
+        rate_limiter.wait()
         response = requests.get(url, params=params, headers=headers)
         response.raise_for_status()
         return response.json()
@@ -53,15 +60,19 @@ def parse_hnm_data(json_data, size, category_name):
             "url": f"https://www2.hm.com{product['url']}",
             "image_url": product["swatches"][0]["productImage"] if product["swatches"] else None,
             "availability": product["availability"]["stockState"],
+            "retailer": "hnm",
         }
         items.append(item)
 
     return items
 
 
-def fetch_all_pages_with_size(category_name, sizes=None, connection=None):
+def fetch_all_pages_with_size(category_name, sizes=None, connection=None, max_workers=None):
     """
     Fetches all products for a given category and size filters, handling pagination.
+    The total page count is read from page 1 and the remaining pages are fetched
+    concurrently within the rate limit. Falls back to following `nextPageNum` when
+    the response carries no page count.
     Stores results in the database if a connection is provided.
     """
     CATEGORY_ID_MAP = {
@@ -78,6 +89,7 @@ def fetch_all_pages_with_size(category_name, sizes=None, connection=None):
 
     }
 
+    max_workers = max_workers or RATE_LIMITS["hnm"]["max_workers"]
     category_id = CATEGORY_ID_MAP.get(category_name)
     if not category_id:
         print(f"Invalid category name: {category_name}")
@@ -87,26 +99,50 @@ def fetch_all_pages_with_size(category_name, sizes=None, connection=None):
 
     all_items = []
     for size, size_code in zip(sizes, size_codes):
-        page = 1
-        while True:
-            print(f"Fetching data for category '{category_name}', size '{size}', page {page}...")
-            data = fetch_hnm_data(category_id, size_filter=size_code, page=page)
-
-            # Stop if no more products found
+        def fetch_page(page):
+            with span("hnm.fetch", category=category_name, size=size, page=page):
+                return fetch_hnm_data(category_id, size_filter=size_code, page=page)
+
+        print(f"Fetching data for category '{category_name}', size '{size}', page 1...")
+        first_page = fetch_page(1)
+
+        # Stop if no products found
+        if not first_page or not first_page.get("plpList", {}).get("productList", []):
+            print(f"No more products found for size '{size}'. Stopping pagination.")
+            continue
+
+        pagination = first_page.get("pagination", {})
+        total_pages = pagination.get("totalPages")
+        pages = [(1, first_page)]
+
+        if total_pages:
+            page_numbers = list(range(2, total_pages + 1))
+            print(f"Found {total_pages} pages for size '{size}', fetching the rest concurrently...")
+            pages.extend(zip(page_numbers, fetch_pages_concurrently(fetch_page, page_numbers, max_workers=max_workers)))
+        else:
+            page = pagination.get("nextPageNum")
+            while page:
+                print(f"Fetching data for category '{category_name}', size '{size}', page {page}...")
+                data = fetch_page(page)
+                pages.append((page, data))
+                if not data:
+                    break
+                page = data.get("pagination", {}).get("nextPageNum")
+
+        for page, data in pages:
             if not data or not data.get("plpList", {}).get("productList", []):
-                print(f"No more products found for size '{size}'. Stopping pagination.")
-                break
+                print(f"No products returned for size '{size}', page {page}.")
+                continue
 
-            items = parse_hnm_data(data, size, category_name)
+            with span("hnm.parse", category=category_name, size=size, page=page):
+                items = parse_hnm_data(data, size, category_name)
             all_items.extend(items)
 
             # Store fetched items in the database
             if connection:
-                store_in_db(items, connection)
+                with span("hnm.store", category=category_name, size=size, page=page):
+                    store_in_db(items, connection)
 
             print(f"Stored {len(items)} items for size '{size}', page {page}.")
-            page = data.get("pagination", {}).get("nextPageNum")
-            if not page:
-                break
 
     return all_items
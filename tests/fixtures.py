@@ -0,0 +1,19 @@
+def make_hnm_page(page, total_pages):
+    """Build a minimal H&M listing response for the given page."""
+    return {
+        "plpList": {"productList": [{
+            "id": f"{page:03d}", "productName": f"Product {page}", "prices": [{"price": 10.0}],
+            "url": f"/p/{page}", "swatches": [], "availability": {"stockState": "Available"},
+        }]},
+        "pagination": {"currentPage": page, "totalPages": total_pages,
+                       "nextPageNum": page + 1 if page < total_pages else None},
+    }
+
+
+def make_asos_page(offset, item_count):
+    """Build a minimal ASOS search response for the given offset, or an empty one past the end."""
+    products = []
+    if offset < item_count:
+        products = [{"id": offset, "name": f"Product {offset}", "price": {"current": {"value": 10.0}},
+                     "url": f"p/{offset}", "imageUrl": None}]
+    return {"itemCount": item_count, "products": products}
@@ -0,0 +1,48 @@
+import unittest
+from unittest.mock import patch
+from db.database import setup_database
+from scrapers.asos_scraper import fetch_all_pages_with_size
+from tests.fixtures import make_asos_page
+
+
+class TestAsosPagination(unittest.TestCase):
+
+    def setUp(self):
+        """Setup an in-memory database for testing."""
+        self.connection = setup_database(test_mode=True)
+
+    def tearDown(self):
+        """Close the database connection after each test."""
+        self.connection.close()
+
+    @patch("scrapers.asos_scraper.fetch_asos_data")
+    def test_fetches_every_offset_from_item_count(self, mock_fetch):
+        """Test that offsets are computed from itemCount and results keep page order."""
+        mock_fetch.side_effect = lambda category_id, size_code, offset=0, limit=72: make_asos_page(offset, 200)
+
+        items = fetch_all_pages_with_size("Jumpers", sizes=["2XL"], connection=self.connection)
+
+        requested_offsets = sorted(call.kwargs["offset"] for call in mock_fetch.call_args_list)
+        self.assertEqual(requested_offsets, [0, 72, 144])
+        self.assertEqual([item["id"] for item in items], [0, 72, 144])
+
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT COUNT(*) FROM items")
+        self.assertEqual(cursor.fetchone()[0], 3)
+
+    @patch("scrapers.asos_scraper.fetch_asos_data")
+    def test_steps_through_offsets_without_item_count(self, mock_fetch):
+        """Test the sequential fallback when itemCount is missing."""
+        def fake_fetch(category_id, size_code, offset=0, limit=72):
+            data = make_asos_page(offset, 200)
+            del data["itemCount"]
+            return data
+        mock_fetch.side_effect = fake_fetch
+
+        items = fetch_all_pages_with_size("Jumpers", sizes=["2XL"])
+
+        self.assertEqual([item["id"] for item in items], [0, 72, 144])
+        self.assertEqual([call.kwargs["offset"] for call in mock_fetch.call_args_list], [0, 72, 144, 216])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+import csv
+import gzip
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+from db.database import setup_database, store_in_db, delete_items, next_change_seq
+from db.export import (export_snapshot, export_table, get_exportable_columns, get_watermark, set_watermark,
+                       setup_watermarks, pq, CsvPartitionWriter, ParquetPartitionWriter)
+
+
+def make_item(product_id, price, retailer="asos"):
+    return {"unique_id": f"{product_id}-2XL", "id": product_id, "name": f"Product {product_id}", "price": price,
+            "size": "2XL", "category": "Jumpers", "url": "http://example.com",
+            "image_url": "http://example.com/image.jpg", "availability": "In Stock", "retailer": retailer}
+
+
+def read_rows(output_dir):
+    """Read back every exported CSV row, keyed by unique_id."""
+    rows = {}
+    for root, _, files in os.walk(output_dir):
+        for file_name in files:
+            with gzip.open(os.path.join(root, file_name), "rt", newline="") as f:
+                for row in csv.DictReader(f):
+                    rows[row["unique_id"]] = (row, os.path.relpath(root, output_dir))
+    return rows
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        """Setup an in-memory database and a temporary export directory."""
+        self.connection = setup_database(test_mode=True)
+        self.output_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Close the database connection and remove exported files."""
+        self.connection.close()
+        self.output_dir.cleanup()
+
+    def export(self, **kwargs):
+        return export_snapshot(self.connection, self.output_dir.name, chunk_size=2,
+                               writer_class=CsvPartitionWriter, **kwargs)
+
+    def test_export_partitions_by_retailer_and_date(self):
+        """Test that rows are written under retailer and crawl date partitions."""
+        store_in_db([make_item(1, 10.0), make_item(2, 20.0), make_item(3, 30.0, retailer="hnm")], self.connection)
+
+        summary = self.export()
+
+        self.assertEqual(summary, {"items": 3, "deleted_items": 0})
+        rows = read_rows(self.output_dir.name)
+        self.assertEqual(set(rows), {"1-2XL", "2-2XL", "3-2XL"})
+        partition = rows["3-2XL"][1].split(os.sep)
+        self.assertEqual(partition[:2], ["items", "retailer=hnm"])
+        self.assertTrue(partition[2].startswith("crawl_date="))
+
+    def test_incremental_export_only_includes_changed_rows(self):
+        """Test that the watermark limits the next export to new or changed rows."""
+        store_in_db([make_item(1, 10.0), make_item(2, 20.0)], self.connection)
+        self.export()
+        watermark = get_watermark(self.connection, "items")
+        self.assertIsNotNone(watermark)
+
+        # Unchanged rows keep their updated_at, so only the repriced and new items are exported.
+        store_in_db([make_item(1, 10.0), make_item(2, 15.0), make_item(4, 40.0)], self.connection)
+        self.output_dir.cleanup()
+        summary = self.export()
+
+        self.assertEqual(summary, {"items": 2, "deleted_items": 0})
+        self.assertEqual(set(read_rows(self.output_dir.name)), {"2-2XL", "4-2XL"})
+        self.assertGreater(get_watermark(self.connection, "items"), watermark)
+
+    def test_full_export_ignores_watermark(self):
+        """Test that a full export includes rows already exported."""
+        store_in_db([make_item(1, 10.0)], self.connection)
+        self.export()
+
+        self.assertEqual(self.export(), {"items": 0, "deleted_items": 0})
+        self.assertEqual(self.export(incremental=False), {"items": 1, "deleted_items": 0})
+
+    def test_deleted_items_are_exported_as_tombstones(self):
+        """Test that rows removed after an export show up in the next incremental export."""
+        store_in_db([make_item(1, 10.0), make_item(2, 20.0)], self.connection)
+        self.export()
+
+        delete_items(["1-2XL"], self.connection)
+        self.output_dir.cleanup()
+
+        self.assertEqual(self.export(), {"items": 0, "deleted_items": 1})
+        row, partition = read_rows(self.output_dir.name)["1-2XL"]
+        self.assertEqual(partition.split(os.sep)[:2], ["deleted_items", "retailer=asos"])
+
+    def test_failed_export_leaves_no_files_and_keeps_watermark(self):
+        """Test that a crash part way through removes partial files and does not advance the watermark."""
+        store_in_db([make_item(1, 10.0), make_item(2, 20.0), make_item(3, 30.0)], self.connection)
+
+        class FailingWriter(CsvPartitionWriter):
+            def write(self, rows):
+                if rows[0][0] == "3-2XL":
+                    raise OSError("disk full")
+                super().write(rows)
+
+        with self.assertRaises(OSError):
+            export_snapshot(self.connection, self.output_dir.name, chunk_size=2, writer_class=FailingWriter)
+
+        exported_files = [f for _, _, files in os.walk(self.output_dir.name) for f in files]
+        self.assertEqual(exported_files, [])
+        self.assertIsNone(get_watermark(self.connection, "items"))
+
+    def test_failed_rename_keeps_watermark(self):
+        """Test that the watermark does not move when the parts cannot be renamed into place."""
+        store_in_db([make_item(1, 10.0)], self.connection)
+        self.export()
+        watermark = get_watermark(self.connection, "items")
+        store_in_db([make_item(2, 20.0)], self.connection)
+
+        with patch("db.export.os.replace", side_effect=OSError("rename failed")):
+            with self.assertRaises(OSError):
+                self.export()
+
+        self.assertEqual(get_watermark(self.connection, "items"), watermark)
+        temp_files = [f for _, _, files in os.walk(self.output_dir.name) for f in files if f.endswith(".tmp")]
+        self.assertEqual(temp_files, [])
+        self.assertEqual(self.export()["items"], 1)
+
+    @unittest.skipUnless(pq, "pyarrow is not installed")
+    def test_parquet_export_keeps_column_types(self):
+        """Test that INTEGER and REAL columns keep numeric types in Parquet."""
+        store_in_db([make_item(1, 10.0)], self.connection)
+
+        export_snapshot(self.connection, self.output_dir.name, writer_class=ParquetPartitionWriter)
+
+        (path,) = [os.path.join(root, f) for root, _, files in os.walk(self.output_dir.name) for f in files]
+        table = pq.read_table(path)
+        self.assertEqual(str(table.schema.field("id").type), "int64")
+        self.assertEqual(str(table.schema.field("price").type), "double")
+        self.assertEqual(table.column("id").to_pylist(), [1])
+
+
+class TestExportConcurrentWrites(unittest.TestCase):
+
+    def setUp(self):
+        """Setup a WAL database file shared by a crawl and an export connection."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.temp_dir.name, "exports")
+        cwd = os.getcwd()
+        os.chdir(self.temp_dir.name)
+        try:
+            self.crawl = setup_database()
+            self.exporter = sqlite3.connect("clothing.db")
+        finally:
+            os.chdir(cwd)
+
+    def tearDown(self):
+        """Close both connections and remove the database and exports."""
+        self.crawl.close()
+        self.exporter.close()
+        self.temp_dir.cleanup()
+
+    def test_rows_committed_after_an_export_are_not_skipped(self):
+        """Test that a batch stamped before an export but committed after it is exported next time."""
+        store_in_db([make_item(1, 10.0)], self.crawl)
+        setup_watermarks(self.exporter)
+
+        # Claim a change number and write without committing, as a crawl in progress would.
+        cursor = self.crawl.cursor()
+        change_seq = next_change_seq(cursor)
+        cursor.execute("INSERT INTO items (unique_id, retailer, updated_at, change_seq) VALUES (?, ?, ?, ?)",
+                       ("2-2XL", "asos", "2026-01-01T00:00:00+00:00", change_seq))
+
+        # The export reads while the batch is in flight, then records its watermark once the crawl commits.
+        columns = get_exportable_columns(self.exporter, "items")
+        first_count, watermark, _ = export_table(self.exporter, "items", columns, self.output_dir, "first",
+                                                 writer_class=CsvPartitionWriter)
+        self.crawl.commit()
+        set_watermark(self.exporter, "items", watermark)
+
+        second = export_snapshot(self.exporter, self.output_dir, writer_class=CsvPartitionWriter)
+
+        self.assertEqual(first_count, 1)
+        self.assertLess(watermark, change_seq)
+        self.assertEqual(second["items"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
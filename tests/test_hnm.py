@@ -0,0 +1,47 @@
+import unittest
+from unittest.mock import patch
+from db.database import setup_database
+from scrapers.hnm_scraper import fetch_all_pages_with_size
+from tests.fixtures import make_hnm_page
+
+
+class TestHnmPagination(unittest.TestCase):
+
+    def setUp(self):
+        """Setup an in-memory database for testing."""
+        self.connection = setup_database(test_mode=True)
+
+    def tearDown(self):
+        """Close the database connection after each test."""
+        self.connection.close()
+
+    @patch("scrapers.hnm_scraper.fetch_hnm_data")
+    def test_fetches_every_page_from_total_pages(self, mock_fetch):
+        """Test that all pages reported by page 1 are fetched and stored in order."""
+        mock_fetch.side_effect = lambda category_id, size_filter=None, page=1: make_hnm_page(page, 4)
+
+        items = fetch_all_pages_with_size("Jeans", sizes=["2XL"], connection=self.connection)
+
+        requested_pages = sorted(call.kwargs["page"] for call in mock_fetch.call_args_list)
+        self.assertEqual(requested_pages, [1, 2, 3, 4])
+        self.assertEqual([item["id"] for item in items], ["001", "002", "003", "004"])
+
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT COUNT(*) FROM items")
+        self.assertEqual(cursor.fetchone()[0], 4)
+
+    @patch("scrapers.hnm_scraper.fetch_hnm_data")
+    def test_follows_next_page_without_total_pages(self, mock_fetch):
+        """Test the nextPageNum fallback when no page count is returned."""
+        def fake_fetch(category_id, size_filter=None, page=1):
+            data = make_hnm_page(page, 3)
+            del data["pagination"]["totalPages"]
+            return data
+        mock_fetch.side_effect = fake_fetch
+
+        items = fetch_all_pages_with_size("Jeans", sizes=["2XL"])
+
+        self.assertEqual([item["id"] for item in items], ["001", "002", "003"])
+
+if __name__ == "__main__":
+    unittest.main()
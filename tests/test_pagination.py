@@ -0,0 +1,49 @@
+import threading
+import unittest
+from unittest.mock import patch
+from utils.pagingation import RateLimiter
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    @patch("utils.pagingation.time.sleep")
+    @patch("utils.pagingation.time.monotonic", return_value=100.0)
+    def test_waits_from_several_threads_are_spaced_out(self, _mock_monotonic, mock_sleep):
+        """Test that concurrent callers are given start times at least min_interval apart."""
+        limiter = RateLimiter(min_interval=1.0)
+        starts = []
+        starts_lock = threading.Lock()
+        slept = threading.local()
+
+        # The clock is frozen, so a caller's start time is the frozen time plus what it slept.
+        mock_sleep.side_effect = lambda delay: setattr(slept, "delay", delay)
+
+        def worker():
+            slept.delay = 0.0
+            limiter.wait()
+            with starts_lock:
+                starts.append(100.0 + slept.delay)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        starts.sort()
+        self.assertEqual(len(starts), 8)
+        self.assertEqual(starts[0], 100.0)
+        for earlier, later in zip(starts, starts[1:]):
+            self.assertGreaterEqual(later - earlier, 1.0)
+
+    @patch("utils.pagingation.time.sleep")
+    def test_zero_interval_never_sleeps(self, mock_sleep):
+        """Test that a limiter without spacing lets every call through immediately."""
+        limiter = RateLimiter(min_interval=0.0)
+        for _ in range(5):
+            limiter.wait()
+
+        mock_sleep.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import cProfile
+import os
+import random
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from db.database import setup_database
+from scheduler import fetch_data
+from tests.fixtures import make_hnm_page
+from utils.profiling import profile_run, phase, span, write_collapsed_stacks, RunProfiler
+
+
+def build_layered_profile(layers=40, calls=300):
+    """
+    Profile calls through a layered graph where every function can call both
+    functions in the next layer. Only `layers * calls` calls run, but the call
+    graph has 2**layers caller/callee paths.
+    """
+    source = []
+    for layer in range(layers + 1):
+        for side in (0, 1):
+            if layer == layers:
+                body = "return bits"
+            else:
+                body = f"return (layer_{layer + 1}_1 if bits >> {layer} & 1 else layer_{layer + 1}_0)(bits)"
+            source.append(f"def layer_{layer}_{side}(bits):\n    {body}\n")
+    namespace = {}
+    exec("\n".join(source), namespace)
+
+    rng = random.Random(0)
+    profile = cProfile.Profile()
+    profile.enable()
+    for _ in range(calls):
+        namespace["layer_0_0"](rng.getrandbits(layers))
+    profile.disable()
+    return profile
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        """Setup an in-memory database and a temporary report directory."""
+        self.connection = setup_database(test_mode=True)
+        self.output_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Close the database connection and remove the reports."""
+        self.connection.close()
+        self.output_dir.cleanup()
+
+    @patch("scrapers.hnm_scraper.fetch_hnm_data")
+    def test_profiled_run_writes_reports(self, mock_fetch):
+        """Test that a profiled fetch records phases and page spans and writes every report."""
+        mock_fetch.side_effect = lambda category_id, size_filter=None, page=1: make_hnm_page(page, 3)
+
+        with profile_run(self.output_dir.name) as profiler:
+            fetch_data(self.connection, [], [{"category_name": "Jeans", "sizes": ["2XL"]}])
+
+        self.assertEqual([name for name, *_ in profiler.phases], ["asos", "hnm", "remove_stale"])
+        span_names = [name for name, *_ in profiler.spans]
+        for name in ("hnm.fetch", "hnm.parse", "hnm.store"):
+            self.assertEqual(span_names.count(name), 3)
+
+        (report_dir,) = os.listdir(self.output_dir.name)
+        report_files = set(os.listdir(os.path.join(self.output_dir.name, report_dir)))
+        self.assertEqual(report_files, {"profile.prof", "stacks.collapsed", "allocations.txt", "spans.csv", "summary.txt"})
+
+        with open(os.path.join(self.output_dir.name, report_dir, "stacks.collapsed")) as f:
+            lines = f.read().splitlines()
+        self.assertTrue(any("fetch_data" in line for line in lines))
+        self.assertTrue(all(line.rsplit(" ", 1)[1].isdigit() for line in lines))
+
+    def test_collapsed_stacks_finish_on_a_path_heavy_graph(self):
+        """Test that stack collapsing stays bounded when the call graph has exponentially many paths."""
+        profile = build_layered_profile()
+        path = os.path.join(self.output_dir.name, "stacks.collapsed")
+
+        worker = threading.Thread(target=write_collapsed_stacks, args=(profile, path), daemon=True)
+        worker.start()
+        worker.join(timeout=10)
+
+        self.assertFalse(worker.is_alive(), "write_collapsed_stacks did not finish within 10s")
+        with open(path) as f:
+            lines = f.read().splitlines()
+        self.assertTrue(lines)
+        self.assertTrue(all(line.rsplit(" ", 1)[1].isdigit() for line in lines))
+
+    def test_phase_peaks_are_measured_per_phase(self):
+        """Test that a light phase does not inherit the peak of an earlier heavy one."""
+        with profile_run(self.output_dir.name) as profiler:
+            with phase("heavy"):
+                buffer = bytearray(20 * 1024 * 1024)
+                del buffer
+            with phase("light"):
+                pass
+
+        peaks = {name: peak for name, _, _, peak in profiler.phases}
+        self.assertGreaterEqual(peaks["heavy"], 20 * 1024 * 1024)
+        self.assertLess(peaks["light"], peaks["heavy"] / 10)
+        self.assertGreaterEqual(profiler.peak_memory, peaks["heavy"])
+
+    @patch.object(RunProfiler, "record_span")
+    def test_span_is_noop_without_profiler(self, mock_record_span):
+        """Test that spans record nothing outside a profiled run."""
+        with span("asos.fetch", offset=0):
+            pass
+
+        mock_record_span.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RateLimiter:
+    """
+    Spaces out calls so that at most one request starts every `min_interval` seconds,
+    no matter how many threads share the limiter.
+    """
+
+    def __init__(self, min_interval=1.0):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        if self.min_interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot)
+            self._next_slot = start + self.min_interval
+        delay = start - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def fetch_pages_concurrently(fetch_page, page_keys, max_workers=4):
+    """
+    Calls `fetch_page(key)` for every key in `page_keys` using a thread pool of at most
+    `max_workers` threads. Results are returned in the same order as `page_keys`.
+    Rate limiting is left to `fetch_page`, so one limiter can be shared across a crawl.
+    """
+    page_keys = list(page_keys)
+    if not page_keys:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(page_keys))) as executor:
+        return list(executor.map(fetch_page, page_keys))
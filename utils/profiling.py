@@ -0,0 +1,249 @@
+import cProfile
+import csv
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+# The profiler for the current run, if any. span() and phase() are no-ops without one.
+_active_profiler = None
+
+TOP_ALLOCATIONS = 25
+
+# Bounds for write_collapsed_stacks; see its docstring.
+MAX_STACK_DEPTH = 64
+MAX_STACK_NODES = 20000
+MIN_STACK_FRACTION = 0.001
+
+
+class RunProfiler:
+    """
+    Collects cProfile stats, tracemalloc snapshots per retailer phase and
+    timing spans for a single crawl run, and writes them out as reports.
+    """
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.spans = []
+        self.phases = []
+        self.snapshots = []
+        self._lock = threading.Lock()
+        self._started_at = None
+        self.wall_time = None
+        self.peak_memory = 0
+
+    def start(self):
+        tracemalloc.start()
+        self.snapshots.append(("start", tracemalloc.take_snapshot()))
+        self._started_at = time.perf_counter()
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+        self.wall_time = time.perf_counter() - self._started_at
+        self.snapshots.append(("end", tracemalloc.take_snapshot()))
+        self.peak_memory = max(self.peak_memory, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    def record_span(self, name, duration, labels):
+        with self._lock:
+            self.spans.append((name, duration, threading.current_thread().name, labels))
+
+    def begin_phase(self):
+        # Fold the peak so far into the run's peak, then measure the phase on its own.
+        with self._lock:
+            self.peak_memory = max(self.peak_memory, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+    def record_phase(self, name, duration):
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        with self._lock:
+            self.peak_memory = max(self.peak_memory, peak)
+            self.phases.append((name, duration, current, peak))
+            self.snapshots.append((name, snapshot))
+
+    def write_reports(self, output_dir):
+        """
+        Writes the run summary, per-span timings, top allocations, raw pstats
+        and a collapsed stack dump (for flamegraph.pl / speedscope) to `output_dir`.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        self.profile.dump_stats(os.path.join(output_dir, "profile.prof"))
+        write_collapsed_stacks(self.profile, os.path.join(output_dir, "stacks.collapsed"))
+        self.write_allocations(os.path.join(output_dir, "allocations.txt"))
+        self.write_spans(os.path.join(output_dir, "spans.csv"))
+        self.write_summary(os.path.join(output_dir, "summary.txt"))
+
+    def write_summary(self, path):
+        totals = {}
+        for name, duration, _, _ in self.spans:
+            count, total, longest = totals.get(name, (0, 0.0, 0.0))
+            totals[name] = (count + 1, total + duration, max(longest, duration))
+
+        with open(path, "w") as f:
+            f.write(f"Wall time: {self.wall_time:.3f}s\n")
+            f.write(f"Peak traced memory: {self.peak_memory / 1024 / 1024:.2f} MiB\n\n")
+            f.write("Phases:\n")
+            for name, duration, current, peak in self.phases:
+                f.write(f"  {name:<20} {duration:>9.3f}s  current {current / 1024 / 1024:>8.2f} MiB"
+                        f"  peak {peak / 1024 / 1024:>8.2f} MiB\n")
+            f.write("\nSpans:\n")
+            f.write(f"  {'name':<20} {'count':>6} {'total':>10} {'mean':>10} {'max':>10}\n")
+            for name, (count, total, longest) in sorted(totals.items()):
+                f.write(f"  {name:<20} {count:>6} {total:>9.3f}s {total / count:>9.3f}s {longest:>9.3f}s\n")
+
+    def write_spans(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["name", "duration_s", "thread", "labels"])
+            for name, duration, thread_name, labels in self.spans:
+                label_text = " ".join(f"{key}={value}" for key, value in labels.items())
+                writer.writerow([name, f"{duration:.6f}", thread_name, label_text])
+
+    def write_allocations(self, path):
+        """
+        Writes the allocations added during each phase, followed by the
+        largest live allocations at the end of the run.
+        """
+        with open(path, "w") as f:
+            for (_, previous), (name, snapshot) in zip(self.snapshots, self.snapshots[1:]):
+                f.write(f"== Allocation growth during '{name}' ==\n")
+                for stat in snapshot.compare_to(previous, "lineno")[:TOP_ALLOCATIONS]:
+                    f.write(f"{stat}\n")
+                f.write("\n")
+
+            f.write("== Top live allocations at end of run ==\n")
+            for stat in self.snapshots[-1][1].statistics("lineno")[:TOP_ALLOCATIONS]:
+                f.write(f"{stat}\n")
+
+
+def format_function(function):
+    file_name, line, name = function
+    if file_name == "~":
+        return name
+    return f"{name} ({os.path.basename(file_name)}:{line})"
+
+
+def write_collapsed_stacks(profile, path):
+    """
+    Reconstructs call stacks from cProfile's caller/callee edges and writes
+    them in the collapsed "a;b;c <microseconds>" format. Time for a function
+    reached from several callers is split by how much each caller contributed.
+
+    The number of caller/callee paths can grow exponentially, so a stack is only
+    expanded while it holds at least MIN_STACK_FRACTION of the run's time, and
+    at most MAX_STACK_NODES stacks are expanded in total. Time below either
+    cut-off is folded into the caller's own time.
+    """
+    stats = pstats.Stats(profile).stats
+    callees = {}
+    for function, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees.setdefault(caller, []).append((cumulative, function))
+    edge_totals = {}
+    for caller, edges in callees.items():
+        edges.sort(key=lambda edge: edge[0], reverse=True)
+        edge_totals[caller] = sum(edge_time for edge_time, _ in edges)
+    names = {function: format_function(function) for function in stats}
+
+    roots = [function for function, values in stats.items() if not values[4]]
+    min_time = sum(stats[root][3] for root in roots) * MIN_STACK_FRACTION
+    lines = {}
+    expanded = 0
+
+    def walk(function, allotted, stack):
+        nonlocal expanded
+        expanded += 1
+        stack = stack + [names[function]]
+        cumulative_time = stats[function][3]
+        scale = allotted / cumulative_time if cumulative_time else 0
+
+        # Recursion can make the callee edges add up to more than the caller's own time.
+        edge_total = edge_totals.get(function, 0) * scale
+        if edge_total > allotted:
+            scale *= allotted / edge_total
+
+        self_time = allotted
+        for edge_time, callee in callees.get(function, []):
+            child_time = edge_time * scale
+            if child_time <= 0 or child_time < min_time:
+                break
+            if len(stack) >= MAX_STACK_DEPTH or expanded >= MAX_STACK_NODES:
+                break
+            if names[callee] in stack:
+                continue
+            self_time -= child_time
+            walk(callee, child_time, stack)
+
+        key = ";".join(stack)
+        lines[key] = lines.get(key, 0) + self_time
+
+    for root in roots:
+        walk(root, stats[root][3], [])
+
+    with open(path, "w") as f:
+        for stack, seconds in lines.items():
+            microseconds = int(seconds * 1_000_000)
+            if microseconds > 0:
+                f.write(f"{stack} {microseconds}\n")
+
+
+@contextmanager
+def span(name, **labels):
+    """
+    Times a block (e.g. fetching, parsing or storing one page) when profiling is active.
+    """
+    profiler = _active_profiler
+    if profiler is None:
+        yield
+        return
+
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.record_span(name, time.perf_counter() - started_at, labels)
+
+
+@contextmanager
+def phase(name):
+    """
+    Marks a retailer phase. The tracemalloc peak is reset when it starts, so the
+    recorded peak covers this phase only, and a snapshot is taken when it ends.
+    """
+    profiler = _active_profiler
+    if profiler is None:
+        yield
+        return
+
+    profiler.begin_phase()
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.record_phase(name, time.perf_counter() - started_at)
+
+
+@contextmanager
+def profile_run(output_root="profiles"):
+    """
+    Profiles everything run inside the block and writes the reports to a
+    timestamped directory under `output_root`.
+    """
+    global _active_profiler
+    profiler = RunProfiler()
+    output_dir = os.path.join(output_root, datetime.now().strftime("%Y%m%d-%H%M%S"))
+
+    _active_profiler = profiler
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _active_profiler = None
+        profiler.write_reports(output_dir)
+        print(f"Profile reports written to '{output_dir}'.")